@@ -200,7 +200,7 @@ class ImportBuildMap(bpy.types.Operator, ImportHelper):
         elif addon_prefs.textureFolder == ImportBuildMapPreferences.textureFolderInvalidText:
             log.debug("The texture folder is set invalid in preferences.")
         else:
-            log.debug("The texture folder is set to: %s" % addon_prefs.textureFolder)
+            log.debug("The texture folder is set to: %s", addon_prefs.textureFolder)
             self.textureFolder = addon_prefs.textureFolder
         
         if self.useUserArt:
@@ -209,7 +209,7 @@ class ImportBuildMap(bpy.types.Operator, ImportHelper):
             elif addon_prefs.userArtTextureFolder == ImportBuildMapPreferences.textureFolderInvalidText:
                 log.debug("The user art texture folder is set invalid in preferences.")
             else:
-                log.debug("The user art texture folder is set to: %s" % addon_prefs.userArtTextureFolder)
+                log.debug("The user art texture folder is set to: %s", addon_prefs.userArtTextureFolder)
                 self.userArtTextureFolder = addon_prefs.userArtTextureFolder
         
         if (self.textureFolder is None) and (self.userArtTextureFolder is None):
@@ -225,14 +225,19 @@ class ImportBuildMap(bpy.types.Operator, ImportHelper):
             self.report({'ERROR'}, 'Parsing file failed!')
         else:
             mapCollection = bpy.data.collections.new(os.path.basename(self.filepath))
-            context.collection.children.link(mapCollection)
             matManager = buildmap_materialmanager.materialManager(self.textureFolder, self.userArtTextureFolder, self.reuseExistingMaterials, self.sampleClosestTexel, self.shadeToVertexColors, self.proceduralMaterialEffects, self.useBackfaceCulling)
             prefix = f"{self.objectPrefix}_" if self.objectPrefix else ""
             importer = buildmap_importer.BuildMapImporter(bmap, matManager, context, mapCollection, prefix)
-            importer.addSpawn()
-            importer.addSprites(self.wallSpriteOffset, self.scaleSpritesLikeInGame, self.shadeToVertexColors)
-            importer.addMapGeometry(self.splitSectors, self.splitWalls, self.splitSky, self.shadeToVertexColors)
-            log.debug("Number of Materials: %s" % len(matManager.materialDict))
+            ## Link the map collection to the scene only once it is filled,
+            ## so the view layer is synced once instead of after every object linked into it.
+            ## Linking in finally keeps a partially imported map reachable if an import step raises.
+            try:
+                importer.addSpawn()
+                importer.addSprites(self.wallSpriteOffset, self.scaleSpritesLikeInGame, self.shadeToVertexColors)
+                importer.addMapGeometry(self.splitSectors, self.splitWalls, self.splitSky, self.shadeToVertexColors)
+            finally:
+                context.collection.children.link(mapCollection)
+            log.debug("Number of Materials: %s", len(matManager.materialDict))
         
         wm.progress_end()
         return {'FINISHED'}
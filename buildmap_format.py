@@ -22,7 +22,6 @@
 
 import logging
 import math
-import os
 import struct
 from collections import namedtuple
 from enum import Enum
@@ -57,30 +56,46 @@ class BuildMap:
             self.numwalls   = None
             self.numsprites = None
     
+    mapVersionStruct     = struct.Struct('<i')
+    mapHeaderStruct      = struct.Struct('<iiihhH')  ## posx, posy, posz, ang, cursectnum, numsectors
+    recordCountStruct    = struct.Struct('<H')       ## numwalls and numsprites in front of their tables
+    ## BUILD units to Blender units, as multipliers. All but the angle are powers of two, so the results are exact.
+    xyScale              = 1 / 512        ## 512 x/y units = 1 m
+    zScale               = 1 / 8192       ## 8192 z units = 1 m (z is 16 times finer than x/y)
+    slopeScale           = 1 / 4096       ## heinum 4096 = 45 degrees
+    angleScale           = -math.pi / 1024  ## 2048 = 360 deg = 2 PI, clockwise
+    supportedMapVersions = range(7, 10)  ## Map versions 7, 8 and 9, membership is a plain integer range check
+    
     def __init__(self, mapFilePath, heuristicWallSearch=False, ignoreErrors=False):
         self.heuristicWallSearch = heuristicWallSearch
         self.ignoreErrors = ignoreErrors
-        if not isinstance(mapFilePath, str) or not os.path.isfile(mapFilePath):
+        ## Shade is a signed byte, so all possible colors can be calculated once up front
+        self.shadeColorDict = {shade: self.calculateShadeColor(shade) for shade in range(-128, 128)}
+        if not isinstance(mapFilePath, str):
             self.handleError(ignorable=False, errorMsg="File not found: %s" % mapFilePath)
             return
 
-        log.debug("Opening file: %s" % mapFilePath)
+        log.debug("Opening file: %s", mapFilePath)
         self.readMapFile(mapFilePath)
 
 
-        self.posxScal = float(self.data.posx) / 512
-        self.posyScal = float(self.data.posy) / 512
-        self.poszScal = float(self.data.posz) / 8192
+        self.posxScal = self.data.posx * self.xyScale
+        self.posyScal = self.data.posy * self.xyScale
+        self.poszScal = self.data.posz * self.zScale
 
         ## Find Wall Loops
         log.debug("Start Finding Wall Loops")
+        getWall = self.getWall  ## Called for every step along a loop
         for sect in self.sectors:
             sectorWallLastIdx = sect.data.wallptr+sect.data.wallnum-1
+            assignedWallIndices = set()  ## Mirrors sect.walls for constant time membership checks
+            findNextIdx = sect.data.wallptr  ## Walls only ever get assigned, so the search for unassigned walls never has to go back
             while len(sect.walls) < sect.data.wallnum:
                 wallLoop = list()
+                wallLoopIndices = set()  ## Mirrors wallLoop for constant time membership checks
                 if len(sect.walls) == 0:
                     ## First loop starts with sect.data.wallptr
-                    firstWallInLoop = self.getWall(sect.data.wallptr)
+                    firstWallInLoop = getWall(sect.data.wallptr)
                     if firstWallInLoop is None:
                         sect.corrupted = True
                         self.handleError(ignorable=True, errorMsg="Unable to find next wall for first loop for sector %s" % sect.sectorIndex)
@@ -88,15 +103,14 @@ class BuildMap:
                 else:
                     ## To find the first wall of the next loop,
                     ## search for the next wall that is not yet assigned
-                    ## starting from the Sectors first wall.
-                    findNextIdx = sect.data.wallptr
+                    ## continuing where the previous search stopped.
                     while True:
-                        wall = self.getWall(findNextIdx)
+                        wall = getWall(findNextIdx)
                         if wall is None:
                             sect.corrupted = True
                             self.handleError(ignorable=True, errorMsg="Unable to find next wall for next loop for sector %s" % sect.sectorIndex)
                             break
-                        if wall not in sect.walls:
+                        if wall.indexInMap not in assignedWallIndices:
                             firstWallInLoop = wall
                             break
                         findNextIdx += 1
@@ -107,11 +121,14 @@ class BuildMap:
                 while True:
                     sect.walls.append(currentWall)
                     wallLoop.append(currentWall)
-                    if (currentWall.data.point2 < sect.data.wallptr) or (currentWall.data.point2 > sectorWallLastIdx):
+                    assignedWallIndices.add(currentWall.indexInMap)
+                    wallLoopIndices.add(currentWall.indexInMap)
+                    point2 = currentWall.data.point2
+                    if not (sect.data.wallptr <= point2 <= sectorWallLastIdx):
                         sect.corrupted = True
-                        self.handleError(ignorable=True, errorMsg="Wall loop extends outside sectors range! wall.data.point2 %s not in range of sector walls! %s to %s for sector %s" % (currentWall.data.point2, sect.data.wallptr, sectorWallLastIdx, sect.sectorIndex))
-                    currentWall = self.getWall(currentWall.data.point2)
-                    if (currentWall is None) or (currentWall in wallLoop) or ((not self.ignoreErrors) and (len(sect.walls) >= sect.data.wallnum)):
+                        self.handleError(ignorable=True, errorMsg="Wall loop extends outside sectors range! wall.data.point2 %s not in range of sector walls! %s to %s for sector %s" % (point2, sect.data.wallptr, sectorWallLastIdx, sect.sectorIndex))
+                    currentWall = getWall(point2)
+                    if (currentWall is None) or (currentWall.indexInMap in wallLoopIndices) or ((not self.ignoreErrors) and (len(sect.walls) >= sect.data.wallnum)):
                         if currentWall is None:
                             sect.corrupted = True
                             self.handleError(ignorable=True, errorMsg="Unable to find next wall for loop of sector %s ! Wall is outside of map range." % sect.sectorIndex)
@@ -120,10 +137,12 @@ class BuildMap:
                             self.handleError(ignorable=True, errorMsg="Wall Loop did not end on first wall in loop in sector %s !" % sect.sectorIndex)
                         if len(sect.walls) > sect.data.wallnum:
                             sect.corrupted = True
-                            log.error("Walls in loop exceed number of walls in sector %s !" % sect.sectorIndex)
+                            log.error("Walls in loop exceed number of walls in sector %s !", sect.sectorIndex)
                         break
                 sect.wallLoops.append(wallLoop)
         log.debug("Finished Finding Wall Loops")
+        ## Sectors are not marked as corrupted after this point, so the filtered list can be kept
+        self.usedSectors = [sect for sect in self.sectors if not sect.corrupted]
 
         ## Link Walls to Sectors
         for sect in self.getSectors():
@@ -133,6 +152,10 @@ class BuildMap:
                     wall.indexInSector = wallIndexInSect
                     wall.sector = sect
                     wallIndexInSect += 1
+            for wall in sect.walls:
+                wall.point2Wall = wall.findPoint2Wall()
+        self.usedWalls = [wall for wall in self.walls if
+                          ((wall.sector is not None) and (not wall.sector.corrupted) and (wall.getPoint2Wall() is not None))]
 
         ## Postprocessing: Find wall and sector neighbors of walls
         if self.heuristicWallSearch:
@@ -143,68 +166,102 @@ class BuildMap:
         ## Postprocessing: Calculate Wall vectors and angles with now known basic properties
         for wall in self.walls:
             if (wall.sector is None) or (wall.sector.corrupted):
-                log.warning("Wall %s is not used or sector is corrupted!" % wall.indexInMap)
+                log.warning("Wall %s is not used or sector is corrupted!", wall.indexInMap)
             else:
                 wall.__post_init__()
 
         ## Postprocessing: Calculate slope for x and y directions separately
+        ## The level objects (and their planes) are only created when first requested
         for sect in self.getSectors():
-            for lvl in self.Level:
-                sect.slopeVector[lvl.name] = Vector(((math.sin(sect.walls[0].angle) * sect.slopeAbs[lvl.name]),
-                                                     (math.cos(sect.walls[0].angle) * -1 * sect.slopeAbs[lvl.name])))
+            firstWallSin = math.sin(sect.walls[0].angle)
+            firstWallCos = math.cos(sect.walls[0].angle) * -1
+            sect.slopeVectorFloor   = Vector((firstWallSin * sect.slopeAbsFloor,   firstWallCos * sect.slopeAbsFloor))
+            sect.slopeVectorCeiling = Vector((firstWallSin * sect.slopeAbsCeiling, firstWallCos * sect.slopeAbsCeiling))
 
-        log.debug("Finished parsing file: %s" % mapFilePath)
+        log.debug("Finished parsing file: %s", mapFilePath)
 
     def readMapFile(self, mapFilePath):
-        with open(mapFilePath, "rb") as mapFile:
-            self.data = BuildMap._MapData()
-            self.data.mapversion = struct.unpack('<i', mapFile.read(4))[0]
-            if self.data.mapversion not in [7, 8, 9]:
-                self.handleError(ignorable=False, errorMsg="Unsupported file! Only BUILD Maps in version 7, 8 and 9 are supported.")
-                return
-
-            self.data.posx = struct.unpack('<i', mapFile.read(4))[0]
-            self.data.posy = struct.unpack('<i', mapFile.read(4))[0]
-            self.data.posz = struct.unpack('<i', mapFile.read(4))[0]
-            self.data.ang = struct.unpack('<h', mapFile.read(2))[0]
-            self.data.cursectnum = struct.unpack('<h', mapFile.read(2))[0]
-            self.data.numsectors = struct.unpack('<H', mapFile.read(2))[0]
-            self.sectors: List[BuildMap.BuildSector] = list()
-            self.walls:   List[BuildMap.BuildWall]   = list()
-            self.sprites: List[BuildMap.BuildSprite] = list()
+        ## Let open() tell us if the file is missing instead of checking the path up front
+        try:
+            mapFile = open(mapFilePath, "rb")
+        except OSError:
+            self.handleError(ignorable=False, errorMsg="File not found: %s" % mapFilePath)
+            return
+        ## Read the whole file with a single call and parse it from memory
+        with mapFile:
+            mapData = memoryview(mapFile.read())
+        offset = 0
+
+        self.data = BuildMap._MapData()
+        (self.data.mapversion,), offset = self.readValues(mapData, offset, self.mapVersionStruct)
+        if self.data.mapversion not in self.supportedMapVersions:
+            self.handleError(ignorable=False, errorMsg="Unsupported file! Only BUILD Maps in version 7, 8 and 9 are supported.")
+            return
 
-            log.debug("mapversion: %s" % self.data.mapversion)
-            log.debug("posx: %s" % self.data.posx)
-            log.debug("posy: %s" % self.data.posy)
-            log.debug("posz: %s" % self.data.posz)
-            log.debug("ang: %s" % self.data.ang)
-            log.debug("cursectnum: %s" % self.data.cursectnum)
-            log.debug("numsectors: %s" % self.data.numsectors)
-
-            self.spawnAngle = BuildMap.calculateAngle(self.data.ang)
-
-            ## Read Sectors
-            for i in range(self.data.numsectors):
-                self.sectors.append(self.BuildSector(mapFile, self, i))
-            self.data.numwalls = struct.unpack('<H', mapFile.read(2))[0]
-            log.debug("numwalls: %s" % self.data.numwalls)
-
-            ## Sanity Check: Number of walls in Secors has to match absolute number of walls
-            numberOfWallsInAllSectors = sum(map(lambda s: s.data.wallnum, self.sectors))
-
-            if numberOfWallsInAllSectors != self.data.numwalls:
-                self.handleError(ignorable=True,
-                                 errorMsg="Number of walls found in Sectors %s does not match given absolute number of walls: %s !" % (
-                                     numberOfWallsInAllSectors, self.data.numwalls))
-
-            ## Read Walls
-            for i in range(self.data.numwalls):
-                self.walls.append(self.BuildWall(mapFile, self, i))
-            ## Read Sprites
-            self.data.numsprites = struct.unpack('<H', mapFile.read(2))[0]
-            log.debug("numsprites: %s" % self.data.numsprites)
-            for i in range(self.data.numsprites):
-                self.sprites.append(self.BuildSprite(mapFile, self, i))
+        (self.data.posx,
+         self.data.posy,
+         self.data.posz,
+         self.data.ang,
+         self.data.cursectnum,
+         self.data.numsectors), offset = self.readValues(mapData, offset, self.mapHeaderStruct)
+        log.debug("mapversion: %s", self.data.mapversion)
+        log.debug("posx: %s", self.data.posx)
+        log.debug("posy: %s", self.data.posy)
+        log.debug("posz: %s", self.data.posz)
+        log.debug("ang: %s", self.data.ang)
+        log.debug("cursectnum: %s", self.data.cursectnum)
+        log.debug("numsectors: %s", self.data.numsectors)
+
+        self.spawnAngle = BuildMap.calculateAngle(self.data.ang)
+
+        ## Read Sectors
+        sectorRecords, offset = self.readRecords(mapData, offset, self.BuildSector.sectorDataStruct, self.data.numsectors)
+        self.sectors: List[BuildMap.BuildSector] = [self.BuildSector(sectorRecord, self, i) for i, sectorRecord in enumerate(sectorRecords)]
+        (self.data.numwalls,), offset = self.readValues(mapData, offset, self.recordCountStruct)
+        log.debug("numwalls: %s", self.data.numwalls)
+
+        ## Sanity Check: Number of walls in Secors has to match absolute number of walls
+        numberOfWallsInAllSectors = sum(map(lambda s: s.data.wallnum, self.sectors))
+
+        if numberOfWallsInAllSectors != self.data.numwalls:
+            self.handleError(ignorable=True,
+                             errorMsg="Number of walls found in Sectors %s does not match given absolute number of walls: %s !" % (
+                                 numberOfWallsInAllSectors, self.data.numwalls))
+
+        ## Read Walls
+        wallRecords, offset = self.readRecords(mapData, offset, self.BuildWall.wallDataStruct, self.data.numwalls)
+        self.walls: List[BuildMap.BuildWall] = [self.BuildWall(wallRecord, self, i) for i, wallRecord in enumerate(wallRecords)]
+        ## Read Sprites
+        (self.data.numsprites,), offset = self.readValues(mapData, offset, self.recordCountStruct)
+        log.debug("numsprites: %s", self.data.numsprites)
+        spriteRecords, offset = self.readRecords(mapData, offset, self.BuildSprite.spriteDataStruct, self.data.numsprites)
+        self.sprites: List[BuildMap.BuildSprite] = [self.BuildSprite(spriteRecord, self, i) for i, spriteRecord in enumerate(spriteRecords)]
+
+        ## Bucket the sprites into their sectors in one pass
+        sectors, numsectors = self.sectors, self.data.numsectors
+        spritesOutOfRange = list()
+        for sprite in self.sprites:
+            sectnum = sprite.data.sectnum
+            if 0 <= sectnum < numsectors:
+                sectors[sectnum].sprites.append(sprite)
+            else:
+                spritesOutOfRange.append(sprite.spriteIndex)
+        if len(spritesOutOfRange) > 0:
+            log.warning("%s sprites have a sectnum that is not in range of maps number of sectors %s: %s",
+                        len(spritesOutOfRange), numsectors, spritesOutOfRange)
+    
+    def readValues(self, mapData, offset, valueStruct):
+        ## Decode a single struct at offset and return it together with the offset behind it
+        if offset + valueStruct.size > len(mapData):
+            self.handleError(ignorable=False, errorMsg="Unexpected end of file! Expected %s bytes at offset %s." % (valueStruct.size, offset))
+        return valueStruct.unpack_from(mapData, offset), offset + valueStruct.size
+    
+    def readRecords(self, mapData, offset, recordStruct, count):
+        ## Decode a whole table of records in a single pass and return it together with the offset behind it
+        tableSize = recordStruct.size * count
+        if offset + tableSize > len(mapData):
+            self.handleError(ignorable=False, errorMsg="Unexpected end of file! Expected %s bytes for %s records but got %s." % (tableSize, count, len(mapData) - offset))
+        return recordStruct.iter_unpack(mapData[offset:offset + tableSize]), offset + tableSize
 
     def getWallListString(self, wall_list):
         return "; ".join([wall.getName() for wall in wall_list])
@@ -217,17 +274,18 @@ class BuildMap:
         for wall in self.getWalls():
             point2Wall = wall.getPoint2Wall()
             if point2Wall is not None:
-                key = tuple(sorted([(wall.data.x, wall.data.y), (point2Wall.data.x, point2Wall.data.y)]))
-                if walls_dict.get(key) is None:
-                    walls_dict[key] = list()
-                walls_dict[key].append(wall)
+                ## Pack each 32 bit coordinate pair into one int, the edge key is the ordered pair of both points
+                startPoint = (wall.data.x << 32) | (wall.data.y & 0xFFFFFFFF)
+                endPoint   = (point2Wall.data.x << 32) | (point2Wall.data.y & 0xFFFFFFFF)
+                key = (startPoint, endPoint) if startPoint < endPoint else (endPoint, startPoint)
+                walls_dict.setdefault(key, []).append(wall)
         for wall_list in walls_dict.values():
             if len(wall_list) < 2:
                 continue  ## This wall has no neighbors
             if (self.data.mapversion < 9) and (len(wall_list) > 2):
-                log.warning("More than 2 neighboring walls found in non-TROR map: %s" % self.getWallListString(wall_list))
+                log.warning("More than 2 neighboring walls found in non-TROR map: %s", self.getWallListString(wall_list))
             if wall_list[0].sector.sectorIndex == wall_list[1].sector.sectorIndex:
-                log.warning("Two walls in same sector found with same coordinates: %s" % self.getWallListString(wall_list))
+                log.warning("Two walls in same sector found with same coordinates: %s", self.getWallListString(wall_list))
                 continue  ## Walls in the same sector can't be neighbors!
             wall_list[0].neighborSectorIndex       = wall_list[1].sector.sectorIndex
             wall_list[0].neighborWallIndexInSector = wall_list[1].indexInSector
@@ -235,26 +293,26 @@ class BuildMap:
             wall_list[1].neighborWallIndexInSector = wall_list[0].indexInSector
     
     def find_wall_neighbors_by_index(self):
+        walls = self.walls
+        numwalls, numsectors = self.data.numwalls, self.data.numsectors
         for wall in self.getWalls():
-            if (wall.data.nextwall >= 0) and (wall.data.nextsector >= 0) and (wall.data.nextwall < self.data.numwalls) and (wall.data.nextsector < self.data.numsectors):
-                wall.neighborSectorIndex = wall.data.nextsector
-                wall.neighborWallIndexInSector = self.walls[wall.data.nextwall].indexInSector
+            nextwall, nextsector = wall.data.nextwall, wall.data.nextsector
+            if (0 <= nextwall < numwalls) and (0 <= nextsector < numsectors):
+                wall.neighborSectorIndex = nextsector
+                wall.neighborWallIndexInSector = walls[nextwall].indexInSector
     
     
     def calculateAngle(buildAngle):
-        return ((float(buildAngle) * math.pi) / 1024) * -1  ## 2048 = 360 deg = 2 PI
+        return buildAngle * BuildMap.angleScale
     
     def getSectors(self):
-        return [sect for sect in self.sectors if not sect.corrupted]
+        return self.usedSectors
     
     def getWall(self, index):
-        if (index < 0) or (index >= len(self.walls)):
-            return None
-        return self.walls[index]
+        return self.walls[index] if 0 <= index < len(self.walls) else None
     
     def getWalls(self):
-        return [wall for wall in self.walls if
-                ((wall.sector is not None) and (not wall.sector.corrupted) and (wall.getPoint2Wall() is not None))]
+        return self.usedWalls
     
     def handleError(self, ignorable=False, errorMsg="Unknown Error!"):
         log.error(errorMsg)
@@ -280,9 +338,9 @@ class BuildMap:
                                                     'floorshade', 'floorpal', 'floorxpanning', 'floorypanning',
                                                     'visibility', 'filler', 'lotag', 'hitag', 'extra'])
         sectorDataFormat = '<hhii4hbBBBhhb5Bhhh'
-        def __init__(self, mapFile, parentBuildMap, index):
-            raw = mapFile.read(struct.calcsize(self.sectorDataFormat))
-            self.data = self.sectorDataNames._make(struct.unpack(self.sectorDataFormat, raw))
+        sectorDataStruct = struct.Struct(sectorDataFormat)
+        def __init__(self, sectorRecord, parentBuildMap, index):
+            self.data = self.sectorDataNames._make(sectorRecord)
             
             self.bmap            = parentBuildMap
             self.sectorIndex     = index
@@ -290,39 +348,34 @@ class BuildMap:
             self.sprites: List[BuildMap.BuildSprite] = list()
             self.wallLoops       = list()  ## List of list of walls that form loops
             self.zScal           = dict()  ## Z-coordinate (height) of floor or ceiling at first point of sector
-            self.slopeAbs        = dict()
-            self.slopeVector     = dict()  ## slope values (float 1 = 45 degrees)
+            self.slopeAbsFloor      = self.data.floorheinum * BuildMap.slopeScale if self.data.floorstat & 2 != 0 else 0.0
+            self.slopeAbsCeiling    = self.data.ceilingheinum * BuildMap.slopeScale if self.data.ceilingstat & 2 != 0 else 0.0
+            self.slopeVectorFloor   = Vector((0.0, 0.0))  ## slope values (float 1 = 45 degrees)
+            self.slopeVectorCeiling = Vector((0.0, 0.0))  ## slope values (float 1 = 45 degrees)
             self.corrupted       = False
-            self.level: List[BuildSector.SectLevel] = list()
-            
-            for lvl in self.bmap.Level:  ## TODO Refactor this, too
-                self.slopeAbs[lvl.name] = 0.0
-                self.slopeVector[lvl.name]  = Vector((0.0, 0.0))
-            if self.data.floorstat & 2 != 0:
-                self.slopeAbs[self.bmap.Level.FLOOR.name] = float(self.data.floorheinum) / 4096
-            if self.data.ceilingstat & 2 != 0:
-                self.slopeAbs[self.bmap.Level.CEILING.name] = float(self.data.ceilingheinum) / 4096
-            
-            for lvl in self.bmap.Level:
-                self.level.append(self.SectLevel(self, lvl))
+            self.level: List[BuildSector.SectLevel] = list()  ## Filled on first access by getAllLevels()
         
         def getPolyLines(self):
-            polylines = list()
-            for wallLoop in self.wallLoops:
-                polyline = list()
-                for wall in wallLoop:
-                    polyline.append(Vector((wall.xScal, wall.yScal)))
-                polylines.append(polyline)
-            return polylines
+            ## Plain (x, y) tuples, tessellate_polygon accepts any coordinate sequence
+            return [[(wall.xScal, wall.yScal) for wall in wallLoop] for wallLoop in self.wallLoops]
+        
+        def getAllLevels(self):
+            if len(self.level) > 0:
+                return self.level
+            else:
+                ## Only valid once the map is fully parsed, as the levels depend on the sectors slope
+                for lvl in self.bmap.Level:
+                    self.level.append(self.SectLevel(self, lvl))
+                return self.level
         
         def getLevel(self, ommitTror=True):
-            return [lvl for lvl in self.level if not ommitTror or not lvl.isTrorOmit()]
+            return [lvl for lvl in self.getAllLevels() if not ommitTror or not lvl.isTrorOmit()]
         
         def getFloor(self):
-            return self.level[0]
+            return self.getAllLevels()[0]
         
         def getCeiling(self):
-            return self.level[1]
+            return self.getAllLevels()[1]
         
         def getName(self, sky=False, prefix=""):
             if sky:
@@ -339,11 +392,25 @@ class BuildMap:
                 self.bmap   = parentSector.bmap
                 self.type   = leveltype
                 if self.type is self.bmap.Level.FLOOR:
-                    self.zScal = float(self.sector.data.floorz) / 8192
+                    self.zScal = self.sector.data.floorz * BuildMap.zScale
                     self.cstat = self.sector.data.floorstat
                 else:
-                    self.zScal = float(self.sector.data.ceilingz) / 8192
+                    self.zScal = self.sector.data.ceilingz * BuildMap.zScale
                     self.cstat = self.sector.data.ceilingstat
+                ## Decode the cstat flags once, they are queried per face and vertex during import
+                cstat = self.cstat
+                self.parallaxing         = bool(cstat & 0x1)
+                self.texSwapXY           = bool(cstat & 0x4)
+                self.texExpansion        = float(((cstat>>3)&1)+1)
+                self.texFlipX            = bool(cstat & 0x10)
+                self.texFlipY            = bool(cstat & 0x20)
+                self.texAlignToFirstWall = bool(cstat & 0x40)
+                self.trorOmit            = (self.bmap.data.mapversion == 9) and bool(cstat & 0x400) and ((cstat & 0x80) == 0)
+                self.texFlipXFactor      = 1 if self.texSwapXY == self.texFlipX else -1
+                self.texFlipYFactor      = 1 if self.texSwapXY == self.texFlipY else -1
+                self.plane = (0.0, 0.0, 0.0, 0.0)  ## Reference point and slope
+                if not self.sector.corrupted:
+                    self.calculatePlane()
 
             def isFloor(self):
                 return self.type is self.bmap.Level.FLOOR
@@ -364,7 +431,7 @@ class BuildMap:
                 return self.sector.data.floorshade if self.isFloor() else self.sector.data.ceilingshade
             
             def getShadeColor(self):
-                return self.bmap.calculateShadeColor(self.getShade())
+                return self.bmap.shadeColorDict[self.getShade()]
 
             def getPal(self):
                 return self.sector.data.floorpal if self.isFloor() else self.sector.data.ceilingpal
@@ -379,45 +446,58 @@ class BuildMap:
                 return float(self.getXPanning()) / 256, float(self.getYPanning()) / 256 * -1
             
             def getTexSwapXY(self): ## mapster32: F flip texture
-                return bool(self.cstat & 0x4)
+                return self.texSwapXY
             
             def getTexExpansion(self): ## mapster32: E toggle sector texture expansion
-                return float(((self.cstat>>3)&1)+1)
+                return self.texExpansion
             
             def getTexFlipX(self): ## mapster32: F flip texture
-                return bool(self.cstat & 0x10)
+                return self.texFlipX
             
             def getTexFlipY(self): ## mapster32: F flip texture
-                return bool(self.cstat & 0x20)
+                return self.texFlipY
             
             def isTexAlignToFirstWall(self): ## mapster32: R toggle sector texture relativity alignment
-                return bool(self.cstat & 0x40)
+                return self.texAlignToFirstWall
             
             def getTexFlipXFactor(self):
-                return 1 if self.getTexSwapXY() == self.getTexFlipX() else -1
+                return self.texFlipXFactor
             
             def getTexFlipYFactor(self):
-                return 1 if self.getTexSwapXY() == self.getTexFlipY() else -1
+                return self.texFlipYFactor
             
             def getHeightAtPos(self, xPos, yPos, respectEffectors=False):  ## TODO respectEffectors is experimental for now
-                slopeX = self.sector.slopeVector[self.type.name].x
-                slopeY = self.sector.slopeVector[self.type.name].y
+                refX, refY, slopeX, slopeY = self.plane
+                zScal = self.getEffectorZScal() if respectEffectors else self.zScal
+                return (refX - xPos)*slopeX + (refY - yPos)*slopeY + zScal
+            
+            def getHeightsAtPositions(self, positions):
+                ## Same as getHeightAtPos for a list of (x, y) positions, unpacking the plane only once
+                refX, refY, slopeX, slopeY = self.plane
                 zScal = self.zScal
-                zC9Sprite = None
-                if respectEffectors:
+                return [(refX - xPos)*slopeX + (refY - yPos)*slopeY + zScal for xPos, yPos in positions]
+            
+            def getEffectorZScal(self):  ## Experimental
+                ## Only floors are affected, so don't scan the sprites for ceilings at all
+                if self.type is self.bmap.Level.FLOOR:
                     for sprite in self.sector.sprites:
                         if sprite.data.lotag == 13:  ## C-9 Explosive Sprite
-                            zC9Sprite = sprite.zScal
-                            break
-                if (zC9Sprite is not None) and (self.type == self.bmap.Level.FLOOR):
-                    zScal = zC9Sprite
-                return (self.sector.walls[0].xScal - xPos)*slopeX + (self.sector.walls[0].yScal - yPos)*slopeY + zScal
+                            return sprite.zScal
+                return self.zScal
+            
+            def calculatePlane(self):
+                ## The level is a plane through the first walls point with the sectors slope.
+                ## Keep it in point-slope form (not folded into a*x+b*y+c) so the heights stay exactly as before,
+                ## degenerate walls with zero height depend on that.
+                slopeVector = self.sector.slopeVectorFloor if self.isFloor() else self.sector.slopeVectorCeiling
+                firstWall = self.sector.walls[0]
+                self.plane = (firstWall.xScal, firstWall.yScal, slopeVector.x, slopeVector.y)
             
             def isParallaxing(self): ## mapster32: P toggle parallax
-                return bool(self.cstat & 0x1)
+                return self.parallaxing
             
             def isTrorOmit(self):  ## Experimental
-                return (self.bmap.data.mapversion == 9) and bool(self.cstat & 0x400) and ((self.cstat & 0x80) == 0)
+                return self.trorOmit
             
             def getName(self, sky=False, prefix=""):
                 lvlName = "Floor" if self.type == self.bmap.Level.FLOOR else "Ceiling"
@@ -427,32 +507,56 @@ class BuildMap:
                     return "%sSector_%03d_%s" % (prefix, self.sector.sectorIndex, lvlName)
     
     class BuildWall:
-        wallDataNames = namedtuple('SectorData', ['x', 'y', 'point2', 'nextwall', 'nextsector', 'cstat', 'picnum',
-                                                  'overpicnum', 'shade', 'pal', 'xrepeat', 'yrepeat', 'xpanning',
-                                                  'ypanning', 'lotag', 'hitag', 'extra'])
+        wallDataNames = namedtuple('WallData', ['x', 'y', 'point2', 'nextwall', 'nextsector', 'cstat', 'picnum',
+                                                'overpicnum', 'shade', 'pal', 'xrepeat', 'yrepeat', 'xpanning',
+                                                'ypanning', 'lotag', 'hitag', 'extra'])
         wallDataFormat = '<ii6hb5Bhhh'
-        def __init__(self, mapFile, parentBuildMap, indexInMap):
-            raw = mapFile.read(struct.calcsize(self.wallDataFormat))
-            self.data = self.wallDataNames._make(struct.unpack(self.wallDataFormat, raw))
+        wallDataStruct = struct.Struct(wallDataFormat)
+        ## Angle and length are rounded to float32 like the mathutils results they replace,
+        ## the sector slopes and wall UVs are calculated from them.
+        angleLengthStruct = struct.Struct('<2f')
+        
+        __slots__ = ('data', 'bmap', 'indexInMap', 'indexInSector', 'sector', 'xScal', 'yScal', 'yScalFlipped',
+                     'neighborSectorIndex', 'neighborWallIndexInSector', 'point2Wall', 'neighborSector', 'neighborWall',
+                     'wallParts', 'angle', 'length', 'names')
+        
+        def __init__(self, wallRecord, parentBuildMap, indexInMap):
+            self.data = self.wallDataNames._make(wallRecord)
             
             self.bmap           = parentBuildMap
             self.indexInMap     = indexInMap
             self.indexInSector  = None
             self.sector         = None
-            self.xScal          = float(self.data.x) / 512
-            self.yScal          = float(self.data.y) / 512
+            self.xScal          = self.data.x * BuildMap.xyScale
+            self.yScal          = self.data.y * BuildMap.xyScale
+            self.yScalFlipped   = self.yScal * -1  ## y in Blender coordinates, where the y axis points the other way
             self.neighborSectorIndex       = -1  ## This has in some cases shown more trustworthy results than relying on the walls nextwall and nextsector fields.
             self.neighborWallIndexInSector = -1  ## This has in some cases shown more trustworthy results than relying on the walls nextwall and nextsector fields.
+            self.point2Wall     = None  ## Resolved once the wall is linked to its sector
+            self.neighborSector = None  ## Resolved in __post_init__
+            self.neighborWall   = None  ## Resolved in __post_init__
+            self.names          = None  ## Formatted by getName()
             self.wallParts: List[BuildWall.WallPart] = list()
             
         def __post_init__(self):
-            self.startVect = Vector((self.xScal, self.yScal*-1))
-            self.endVect   = Vector((self.getPoint2Wall().xScal, self.getPoint2Wall().yScal*-1))
-            self.wallVect  = self.endVect - self.startVect
-            self.angle     = Vector((1,0)).angle_signed(self.wallVect)
-            self.length    = self.wallVect.length
+            point2Wall = self.getPoint2Wall()
+            deltaX = point2Wall.xScal - self.xScal
+            deltaY = point2Wall.yScalFlipped - self.yScalFlipped
+            ## Same as Vector((1,0)).angle_signed(Vector((deltaX, deltaY))) and its length, clockwise is positive
+            self.angle, self.length = self.angleLengthStruct.unpack(self.angleLengthStruct.pack(math.atan2(-deltaY, deltaX), math.hypot(deltaX, deltaY)))
+            self.neighborSector = self.findNeighborSector()
+            self.neighborWall   = self.findNeighborWall()
         
         def getPoint2Wall(self):
+            return self.point2Wall
+        
+        def getNeighborSector(self):
+            return self.neighborSector
+        
+        def getNeighborWall(self):
+            return self.neighborWall
+        
+        def findPoint2Wall(self):
             if (self.data.point2 < self.sector.data.wallptr) \
                     or (self.data.point2 >= self.bmap.data.numwalls) \
                     or (self.data.point2 >= (self.sector.data.wallptr + self.sector.data.wallnum)):
@@ -460,15 +564,15 @@ class BuildMap:
             else:
                 return self.bmap.getWall(self.data.point2)
         
-        def getNeighborSector(self):
+        def findNeighborSector(self):
             if (self.neighborSectorIndex < 0) or (self.neighborSectorIndex >= self.bmap.data.numsectors):
                 return None
             if self.bmap.sectors[self.neighborSectorIndex].corrupted:
                 return None
             return self.bmap.sectors[self.neighborSectorIndex]
         
-        def getNeighborWall(self):
-            neighborSect = self.getNeighborSector()
+        def findNeighborWall(self):
+            neighborSect = self.findNeighborSector()
             if (neighborSect is None) \
                     or (self.neighborWallIndexInSector < 0) \
                     or (self.neighborWallIndexInSector >= neighborSect.data.wallnum):
@@ -492,10 +596,11 @@ class BuildMap:
             return float(1) - float((self.data.cstat >> 8) & 1) * 2
         
         def getName(self, useIndexInMap=False, prefix=""):
-            if useIndexInMap:
-                return "%sSector_%03d_MapWall_%03d" % (prefix, self.sector.sectorIndex, self.indexInMap)
-            else:
-                return "%sSector_%03d_SctWall_%03d" % (prefix, self.sector.sectorIndex, self.indexInSector)
+            ## Both variants are formatted on first use, the wall must be linked to its sector by then
+            if self.names is None:
+                self.names = ("Sector_%03d_SctWall_%03d" % (self.sector.sectorIndex, self.indexInSector),
+                              "Sector_%03d_MapWall_%03d" % (self.sector.sectorIndex, self.indexInMap))
+            return prefix + self.names[useIndexInMap]
         
         def getWallParts(self):
             if len(self.wallParts) > 0:
@@ -512,11 +617,22 @@ class BuildMap:
                 return self.wallParts
     
         class WallPart:
+            ## Vertices to keep for each case of ((wallHeight > 0) << 1) | (nextWallHeight > 0)
+            ## as indices into (a, b, c, d, clippedVert). Walls with no surface are skipped.
+            clippedVertexIndices = ((), (4, 1, 2), (0, 4, 3), (0, 1, 2, 3))
+            ## Vertices are rounded to float32 like Blender stores them, so zero height and
+            ## clipping decisions are made on the same values that end up in the mesh.
+            vertexStruct = struct.Struct('<3f')
+            
+            __slots__ = ('wall', 'bmap', 'vertices', 'wallType', 'nameSuffix', 'sectBotLevel', 'sectTopLevel',
+                         'alignTexZ', 'neighborSector', 'zBottom', 'sky')
+            
             def __init__(self, parentWall, neighborSector, isRedTopWall):
                 self.wall         = parentWall
                 self.bmap         = self.wall.bmap
-                self.vertices     = list()
+                self.vertices     = list()  ## Plain (x, y, z) tuples
                 self.wallType     = None
+                self.nameSuffix   = ""
                 self.sectBotLevel = None
                 self.sectTopLevel = None
                 self.alignTexZ    = 0
@@ -536,6 +652,7 @@ class BuildMap:
                     else:
                         ## Case 2 (bottom portion of red wall)
                         self.wallType      = self.bmap.WallType.REDBOT
+                        self.nameSuffix    = "_Bot"
                         self.sectTopLevel  = self.neighborSector.getFloor()
                         if self.wall.getTexAlignFlag():
                             self.alignTexZ = self.wall.sector.getCeiling().zScal   ## Flags = 4: Aligned to ceiling of own sector
@@ -544,6 +661,7 @@ class BuildMap:
                 else:
                     ## Case 3 (top portion of red wall)
                     self.wallType      = self.bmap.WallType.REDTOP
+                    self.nameSuffix    = "_Top"
                     self.sectBotLevel  = self.neighborSector.getCeiling()
                     self.sectTopLevel  = self.wall.sector.getCeiling()
                     if self.wall.getTexAlignFlag():
@@ -551,152 +669,153 @@ class BuildMap:
                     else:
                         self.alignTexZ = self.neighborSector.getCeiling().zScal    ## Flags = 0: Aligned to ceiling of neighbor sector (lower edge of upper wall portion)
                 
+                ## A red wall part is sky if the levels it connects are both parallaxing.
+                ## The bottom part connects both floors, the top part both ceilings.
+                self.sky = (self.neighborSector is not None) and self.sectBotLevel.isParallaxing() and self.sectTopLevel.isParallaxing()
                 self.zBottom = self.sectBotLevel.zScal
                 point2Wall = self.wall.getPoint2Wall()
                 if point2Wall is not None:
-                    self.vertices.append(Vector(( self.wall.xScal,  self.wall.yScal,  self.sectBotLevel.getHeightAtPos(self.wall.xScal,  self.wall.yScal)  )))
-                    self.vertices.append(Vector(( point2Wall.xScal, point2Wall.yScal, self.sectBotLevel.getHeightAtPos(point2Wall.xScal, point2Wall.yScal) )))
-                    self.vertices.append(Vector(( point2Wall.xScal, point2Wall.yScal, self.sectTopLevel.getHeightAtPos(point2Wall.xScal, point2Wall.yScal) )))
-                    self.vertices.append(Vector(( self.wall.xScal,  self.wall.yScal,  self.sectTopLevel.getHeightAtPos(self.wall.xScal,  self.wall.yScal)  )))
+                    x1, y1 = self.wall.xScal, self.wall.yScal
+                    x2, y2 = point2Wall.xScal, point2Wall.yScal
+                    botHeightAtPos = self.sectBotLevel.getHeightAtPos
+                    topHeightAtPos = self.sectTopLevel.getHeightAtPos
+                    toFloat32 = self.vertexStruct
+                    self.vertices.append(toFloat32.unpack(toFloat32.pack( x1, y1, botHeightAtPos(x1, y1) )))
+                    self.vertices.append(toFloat32.unpack(toFloat32.pack( x2, y2, botHeightAtPos(x2, y2) )))
+                    self.vertices.append(toFloat32.unpack(toFloat32.pack( x2, y2, topHeightAtPos(x2, y2) )))
+                    self.vertices.append(toFloat32.unpack(toFloat32.pack( x1, y1, topHeightAtPos(x1, y1) )))
             
             def getClippedVertices(self):
-                cverts = list()
                 if len(self.vertices) != 4:
-                    return cverts
+                    return list()
                 a, b, c, d = self.vertices
-                wallHeight     = d.z*-1 - a.z*-1  ## z height on this wall (sectTop - sectBot)
-                nextWallHeight = c.z*-1 - b.z*-1  ## z height on next wall (sectTop - sectBot)
-                diffHeight = (wallHeight - nextWallHeight)
-                if diffHeight != 0:
-                    ratio = wallHeight / diffHeight
-                    clippedVert = Vector(( ((b.x-a.x)*ratio + a.x),   
-                                           ((b.y-a.y)*ratio + a.y),
-                                           ((b.z-a.z)*ratio + a.z) ))
-                if wallHeight > 0:
-                    cverts.append(a)
-                    if nextWallHeight > 0:
-                        cverts.append(b)
-                        cverts.append(c)
-                    else:
-                        cverts.append(clippedVert)
-                    cverts.append(d)
-                else:
-                    if nextWallHeight > 0:
-                        cverts.append(clippedVert)
-                        cverts.append(b)
-                        cverts.append(c)
-                    #else: ## skip for walls with no surface.
-                return cverts
+                wallHeight     = a[2] - d[2]  ## z height on this wall (sectTop - sectBot, z points down)
+                nextWallHeight = b[2] - c[2]  ## z height on next wall (sectTop - sectBot, z points down)
+                case = ((wallHeight > 0) << 1) | (nextWallHeight > 0)
+                clippedVert = None
+                if case == 1 or case == 2:
+                    ## Exactly one side has a surface, so top and bottom intersect in between and the heights differ
+                    ## Point on the bottom edge where top and bottom intersect
+                    factor = wallHeight / (wallHeight - nextWallHeight)
+                    clippedVert = self.vertexStruct.unpack(self.vertexStruct.pack(a[0] + (b[0]-a[0])*factor, a[1] + (b[1]-a[1])*factor, a[2] + (b[2]-a[2])*factor))
+                verts = (a, b, c, d, clippedVert)
+                return [verts[idx] for idx in self.clippedVertexIndices[case]]
             
             def isSky(self):
-                if self.wallType == self.bmap.WallType.REDBOT:
-                    return self.wall.sector.getFloor().isParallaxing() and self.neighborSector.getFloor().isParallaxing()
-                elif self.wallType == self.bmap.WallType.REDTOP:
-                    return self.wall.sector.getCeiling().isParallaxing() and self.neighborSector.getCeiling().isParallaxing()
-                else:
-                    return False
+                return self.sky
             
             def getPicNum(self):
                 ## Get picnum, taking swapped textures for bottom walls into account
                 neighborWall = self.wall.getNeighborWall()
-                if (self.wallType == self.bmap.WallType.REDBOT) and self.wall.getTexBottomSwap() and (neighborWall is not None):
+                if (self.wallType is self.bmap.WallType.REDBOT) and self.wall.getTexBottomSwap() and (neighborWall is not None):
                     return neighborWall.data.picnum
                 else:
                     return self.wall.data.picnum
             
             def getShadeColor(self):
-                return self.bmap.calculateShadeColor(self.wall.data.shade)
+                return self.bmap.shadeColorDict[self.wall.data.shade]
             
             def getName(self, useIndexInMap=False, prefix=""):
-                if self.wallType == self.bmap.WallType.REDBOT:
-                    return self.wall.getName(useIndexInMap, prefix)+"_Bot"
-                elif self.wallType == self.bmap.WallType.REDTOP:
-                    return self.wall.getName(useIndexInMap, prefix)+"_Top"
-                else:
-                    return self.wall.getName(useIndexInMap, prefix)
+                return self.wall.getName(useIndexInMap, prefix) + self.nameSuffix
     
     
     class BuildSprite:
-        spriteDataNames = namedtuple('SectorData', ['x', 'y', 'z', 'cstat', 'picnum', 'shade', 'pal', 'clipdist', 'filler',
+        spriteDataNames = namedtuple('SpriteData', ['x', 'y', 'z', 'cstat', 'picnum', 'shade', 'pal', 'clipdist', 'filler',
                                                     'xrepeat', 'yrepeat', 'xoffset', 'yoffset', 'sectnum', 'statnum', 'ang',
                                                     'owner', 'xvel', 'yvel', 'zvel', 'lotag', 'hitag', 'extra'])
         spriteDataFormat = '<iiihhb5Bbb10h'
-        def __init__(self, mapFile, parentBuildMap, index):
-            raw = mapFile.read(struct.calcsize(self.spriteDataFormat))
-            self.data = self.spriteDataNames._make(struct.unpack(self.spriteDataFormat, raw))
+        spriteDataStruct = struct.Struct(spriteDataFormat)
+        gunAmmoPicnums         = frozenset((21, 22, 23, 24, 25, 26, 27, 28, 29, 32, 37, 40, 41, 42, 44, 45, 46, 47, 49))
+        healthEquipmentPicnums = frozenset((51, 52, 53, 54, 55, 56, 57, 59, 60, 61, 100))
+        pickupPicnums          = gunAmmoPicnums | healthEquipmentPicnums  ## Scaled like in game by getScale()
+        pickupScales           = {26: (0.125, 0.125, 0.125),  ## HEAVYHBOMB
+                                  40: (0.25, 0.25, 0.25)}     ## AMMO, all other pickups are scaled by 0.5
+        repeatScale            = 1 / 64  ## x/yrepeat 64 = scale 1, a power of two so the multiplication is exact
+        
+        __slots__ = ('data', 'bmap', 'spriteIndex', 'xScal', 'yScal', 'zScal', 'angle',
+                     'flippedX', 'flippedY', 'faceSprite', 'wallSprite', 'floorSprite', 'realCentered', 'effectSprite', 'kind',
+                     'dataKey', 'name')
+        
+        def __init__(self, spriteRecord, parentBuildMap, index):
+            self.data = data = self.spriteDataNames._make(spriteRecord)
             
             self.bmap        = parentBuildMap
             self.spriteIndex = index
-            self.xScal       = float(self.data.x) / 512
-            self.yScal       = float(self.data.y) / 512
-            self.zScal       = float(self.data.z) / 8192
-            self.angle       = BuildMap.calculateAngle(self.data.ang)
-            if 0 <= self.data.sectnum < self.bmap.data.numsectors:
-                self.bmap.sectors[self.data.sectnum].sprites.append(self)
-            else:
-                log.warning("Sprite %s sectnum is not in range of maps number of sectors: %s" % (self.spriteIndex, self.bmap.data.numsectors))
+            self.name        = "Sprite_%03d" % index
+            self.xScal       = data.x * BuildMap.xyScale
+            self.yScal       = data.y * BuildMap.xyScale
+            self.zScal       = data.z * BuildMap.zScale
+            self.angle       = data.ang * BuildMap.angleScale  ## Same as BuildMap.calculateAngle(), without the call
+            
+            ## Decode the cstat bits once, the predicates below are queried several times per sprite
+            cstat = data.cstat
+            spriteType = (cstat>>4)&3
+            self.flippedX     = cstat&4 != 0    ## cstat bit 2: 1 = x-flipped, 0 = normal
+            self.flippedY     = cstat&8 != 0    ## cstat bit 3: 1 = y-flipped, 0 = normal
+            self.faceSprite   = spriteType == 0 ## cstat bits 5-4: 00 = FACE sprite (default)
+            self.wallSprite   = spriteType == 1 ## cstat bits 5-4: 01 = WALL sprite (like masked walls)
+            self.floorSprite  = spriteType == 2 ## cstat bits 5-4: 10 = FLOOR sprite (parallel to ceilings&floors)
+            self.realCentered = cstat&128 != 0  ## cstat bit 7: 1 = Real centered centering, 0 = foot center
+            ## https://wiki.eduke32.com/wiki/Special_Tile_Reference_Guide
+            ## https://wiki.eduke32.com/wiki/Sector_effectors
+            ## https://wiki.eduke32.com/wiki/Tilenum
+            ## https://wiki.eduke32.com/wiki/Actor
+            self.effectSprite = 1 <= data.picnum <= 10
+            ## 0 = effect, 1 = face, 2 = wall, 3 = floor, 4 = unknown sprite type (cstat bits 5-4: 11)
+            self.kind = 0 if self.effectSprite else spriteType + 1
+            ## This must be a key that is individual for every aspect of a Sprite
+            ## that makes it neccessary to have a separate Datablock.
+            ## So that when used for a dictionary we can reuse existing datablocks when they make no difference to the sprite.
+            ## The flip and centering bits are taken as they are, the sprite type only matters as floor or not.
+            self.dataKey = (data.picnum, (cstat & 0x8C) | (0x20 if self.floorSprite else 0))
         
         def isFlippedX(self):
-            ## cstat bit 2: 1 = x-flipped, 0 = normal
-            return self.data.cstat&4 != 0
+            return self.flippedX
         
         def isFlippedY(self):
-            ## cstat bit 3: 1 = y-flipped, 0 = normal
-            return self.data.cstat&8 != 0
+            return self.flippedY
         
         def isFaceSprite(self):
-            ## cstat bits 5-4: 00 = FACE sprite (default)
-            return ((self.data.cstat>>4)&3) == 0
+            return self.faceSprite
         
         def isWallSprite(self):
-            ## cstat bits 5-4: 01 = WALL sprite (like masked walls)
-            return ((self.data.cstat>>4)&3) == 1
+            return self.wallSprite
         
         def isFloorSprite(self):
-            ## cstat bits 5-4: 10 = FLOOR sprite (parallel to ceilings&floors)
-            return ((self.data.cstat>>4)&3) == 2
+            return self.floorSprite
         
         def isRealCentered(self):
-            ## cstat bit 7: 1 = Real centered centering, 0 = foot center
-            return self.data.cstat&128 != 0
+            return self.realCentered
+        
+        def getKind(self):
+            return self.kind
         
         def getDataKey(self):
-            ## This must return a key that is individual for every aspect of a Sprite
-            ## that makes it neccessary to have a separate Datablock.
-            ## So that when used for a dictionary we can reuse existing datablocks when they make no difference to the sprite.
-            return (self.data.picnum, self.isFlippedX(), self.isFlippedY(), self.isFloorSprite(), self.isRealCentered())
+            return self.dataKey
         
         def isEffectSprite(self):
-            ## https://wiki.eduke32.com/wiki/Special_Tile_Reference_Guide
-            ## https://wiki.eduke32.com/wiki/Sector_effectors
-            ## https://wiki.eduke32.com/wiki/Tilenum
-            ## https://wiki.eduke32.com/wiki/Actor
-            return (self.data.picnum >= 1) and (self.data.picnum <= 10)
+            return self.effectSprite
         
         def isGunAmmo(self):
-            return self.data.picnum in [21, 22, 23, 24, 25, 26, 27, 28, 29, 32, 37, 40, 41, 42, 44, 45, 46, 47, 49]
+            return self.data.picnum in self.gunAmmoPicnums
         
         def isHealthEquipment(self):
-            return self.data.picnum in [51, 52, 53, 54, 55, 56, 57, 59, 60, 61, 100]
+            return self.data.picnum in self.healthEquipmentPicnums
         
         def getScale(self, like_in_game=True):
             ## Return normalized Scale with 64 as 1
-            if self.isFloorSprite():
-                scale = ((self.data.yrepeat/64), (self.data.xrepeat/64), (self.data.xrepeat/64))
-            else:
-                scale = ((self.data.xrepeat/64), (self.data.xrepeat/64), (self.data.yrepeat/64))
-            if like_in_game and (self.isGunAmmo() or self.isHealthEquipment()):
-                if self.data.picnum == 26:  ## HEAVYHBOMB
-                    return (0.125, 0.125, 0.125)
-                elif self.data.picnum == 40:  ## AMMO
-                    return (0.25, 0.25, 0.25)
-                else:
-                    return (0.5, 0.5, 0.5)
+            data = self.data
+            if like_in_game and (data.picnum in self.pickupPicnums):
+                return self.pickupScales.get(data.picnum, (0.5, 0.5, 0.5))
+            xScale = data.xrepeat * self.repeatScale
+            yScale = data.yrepeat * self.repeatScale
+            if self.floorSprite:
+                return (yScale, xScale, xScale)
             else:
-                return scale
+                return (xScale, xScale, yScale)
             
         def getShadeColor(self):
-            return self.bmap.calculateShadeColor(self.data.shade)
+            return self.bmap.shadeColorDict[self.data.shade]
         
         def getName(self, prefix=""):
-            return "%sSprite_%03d" % (prefix, self.spriteIndex)
+            return prefix + self.name
@@ -22,6 +22,7 @@
 
 import logging
 import math
+import struct
 
 import bpy
 import mathutils
@@ -32,6 +33,18 @@ log = logging.getLogger(__name__)
 
 
 class BuildMapImporter:
+    ## Binary strings of the multi bit cstat fields saved as custom properties, indexed by the field value
+    bitStrings2 = tuple("0b{:02b}".format(value) for value in range(4))
+    bitStrings3 = tuple("0b{:03b}".format(value) for value in range(8))
+    bitStrings4 = tuple("0b{:04b}".format(value) for value in range(16))
+    bitStrings5 = tuple("0b{:05b}".format(value) for value in range(32))
+    ## UVs of the sprite quad corners for every (flipX, flipY) combination
+    spriteQuadUVs = {(flipX, flipY): ((1-flipX, flipY), (1-flipX, 1-flipY), (flipX, 1-flipY), (flipX, flipY))
+                     for flipX in (0, 1) for flipY in (0, 1)}
+    ## Rounds values to float32 like the mathutils Vector results they replace
+    float32Struct = struct.Struct('<f')
+    float32x4Struct = struct.Struct('<4f')
+    
     def __init__(self, buildMap, matManager, context, mapCollection, objectPrefix=""):
         self.bmap          = buildMap
         self.matManager    = matManager
@@ -39,6 +52,14 @@ class BuildMapImporter:
         self.mapCollection = mapCollection
         self.objectPrefix  = objectPrefix
         self.wm            = self.context.window_manager
+        self.lastProgressPercent = -1
+    
+    def updateProgress(self, fraction):
+        ## Only pass whole percent steps on to the window manager, it is called for every sprite and sector
+        percent = int(fraction * 100)
+        if percent != self.lastProgressPercent:
+            self.lastProgressPercent = percent
+            self.wm.progress_update(fraction)
     
     def saveMapCustomProps(self, obj):
         if (self.bmap is not None) and (obj is not None):
@@ -54,136 +75,155 @@ class BuildMapImporter:
     
     def saveLevelCustomProps(self, level, obj):
         if (level is not None) and (obj is not None):
-            obj["wallptr"]                 = level.sector.data.wallptr
-            obj["wallnum"]                 = level.sector.data.wallnum
+            data  = level.sector.data
+            cstat = level.cstat
+            obj["wallptr"]                 = data.wallptr
+            obj["wallnum"]                 = data.wallnum
             obj["z"]                       = level.getZ()
-            obj["cstat bit00 parallaxing"] = (level.cstat>>0)&1
-            obj["cstat bit01 sloped"]      = (level.cstat>>1)&1
-            obj["cstat bit02 swap-xy"]     = (level.cstat>>2)&1
-            obj["cstat bit03 smoothness"]  = (level.cstat>>3)&1
-            obj["cstat bit04 x-flip"]      = (level.cstat>>4)&1
-            obj["cstat bit05 y-flip"]      = (level.cstat>>5)&1
-            obj["cstat bit06 align"]       = (level.cstat>>6)&1
-            obj["cstat bit07 masked"]      = (level.cstat>>7)&1
-            obj["cstat bit08 trans"]       = (level.cstat>>8)&1
-            obj["cstat bit09 TROR movblk"] = (level.cstat>>9)&1
-            obj["cstat bit10 TROR"]        = (level.cstat>>10)&1
-            obj["cstat bit11 TROR prjblk"] = (level.cstat>>11)&1
-            obj["cstat bit12-15 reserved"] = "0b%s" % format(((level.cstat>>12)&15),'b').zfill(4)
+            obj["cstat bit00 parallaxing"] = (cstat>>0)&1
+            obj["cstat bit01 sloped"]      = (cstat>>1)&1
+            obj["cstat bit02 swap-xy"]     = (cstat>>2)&1
+            obj["cstat bit03 smoothness"]  = (cstat>>3)&1
+            obj["cstat bit04 x-flip"]      = (cstat>>4)&1
+            obj["cstat bit05 y-flip"]      = (cstat>>5)&1
+            obj["cstat bit06 align"]       = (cstat>>6)&1
+            obj["cstat bit07 masked"]      = (cstat>>7)&1
+            obj["cstat bit08 trans"]       = (cstat>>8)&1
+            obj["cstat bit09 TROR movblk"] = (cstat>>9)&1
+            obj["cstat bit10 TROR"]        = (cstat>>10)&1
+            obj["cstat bit11 TROR prjblk"] = (cstat>>11)&1
+            obj["cstat bit12-15 reserved"] = self.bitStrings4[(cstat>>12)&15]
             obj["picnum"]                  = level.getPicNum()
             obj["heinum"]                  = level.getHeiNum()
             obj["shade"]                   = level.getShade()
             obj["pal"]                     = level.getPal()
             obj["xpanning"]                = level.getXPanning()
             obj["ypanning"]                = level.getYPanning()
-            obj["visibility"]              = level.sector.data.visibility
-            obj["filler"]                  = level.sector.data.filler
-            obj["lotag"]                   = level.sector.data.lotag
-            obj["hitag"]                   = level.sector.data.hitag
-            obj["extra"]                   = level.sector.data.extra
+            obj["visibility"]              = data.visibility
+            obj["filler"]                  = data.filler
+            obj["lotag"]                   = data.lotag
+            obj["hitag"]                   = data.hitag
+            obj["extra"]                   = data.extra
     
     def saveWallCustomProps(self, wall, obj):
         if (wall is not None) and (obj is not None):
-            obj["x"]          = wall.data.x
-            obj["y"]          = wall.data.y
-            obj["point2"]     = wall.data.point2
-            obj["nextwall"]   = wall.data.nextwall
-            obj["nextsector"] = wall.data.nextsector
-            obj["cstat bit00 blocking1"]         = (wall.data.cstat>>0)&1
-            obj["cstat bit01 swap bot of invis"] = (wall.data.cstat>>1)&1
-            obj["cstat bit02 align to bot"]      = (wall.data.cstat>>2)&1
-            obj["cstat bit03 flip x"]            = (wall.data.cstat>>3)&1
-            obj["cstat bit04 masking"]           = (wall.data.cstat>>4)&1
-            obj["cstat bit05 1-way"]             = (wall.data.cstat>>5)&1
-            obj["cstat bit06 blocking2"]         = (wall.data.cstat>>6)&1
-            obj["cstat bit07 transluscence"]     = (wall.data.cstat>>7)&1
-            obj["cstat bit08 flip y"]            = (wall.data.cstat>>8)&1
-            obj["cstat bit09 transl. rev."]      = (wall.data.cstat>>9)&1
-            obj["cstat bit10 yax upwall"]        = (wall.data.cstat>>10)&1
-            obj["cstat bit11 yax downwall"]      = (wall.data.cstat>>11)&1
-            obj["cstat bit12 rot 90deg"]         = (wall.data.cstat>>12)&1
-            obj["cstat bit13-15 reserved"]       = "0b%s" % format(((wall.data.cstat>>13)&7),'b').zfill(3)
-            obj["picnum"]     = wall.data.picnum
-            obj["overpicnum"] = wall.data.overpicnum
-            obj["shade"]      = wall.data.shade
-            obj["pal"]        = wall.data.pal
-            obj["xrepeat"]    = wall.data.xrepeat
-            obj["yrepeat"]    = wall.data.yrepeat
-            obj["xpanning"]   = wall.data.xpanning
-            obj["ypanning"]   = wall.data.ypanning
-            obj["lotag"]      = wall.data.lotag
-            obj["hitag"]      = wall.data.hitag
-            obj["extra"]      = wall.data.extra
+            data  = wall.data
+            cstat = data.cstat
+            obj["x"]          = data.x
+            obj["y"]          = data.y
+            obj["point2"]     = data.point2
+            obj["nextwall"]   = data.nextwall
+            obj["nextsector"] = data.nextsector
+            obj["cstat bit00 blocking1"]         = (cstat>>0)&1
+            obj["cstat bit01 swap bot of invis"] = (cstat>>1)&1
+            obj["cstat bit02 align to bot"]      = (cstat>>2)&1
+            obj["cstat bit03 flip x"]            = (cstat>>3)&1
+            obj["cstat bit04 masking"]           = (cstat>>4)&1
+            obj["cstat bit05 1-way"]             = (cstat>>5)&1
+            obj["cstat bit06 blocking2"]         = (cstat>>6)&1
+            obj["cstat bit07 transluscence"]     = (cstat>>7)&1
+            obj["cstat bit08 flip y"]            = (cstat>>8)&1
+            obj["cstat bit09 transl. rev."]      = (cstat>>9)&1
+            obj["cstat bit10 yax upwall"]        = (cstat>>10)&1
+            obj["cstat bit11 yax downwall"]      = (cstat>>11)&1
+            obj["cstat bit12 rot 90deg"]         = (cstat>>12)&1
+            obj["cstat bit13-15 reserved"]       = self.bitStrings3[(cstat>>13)&7]
+            obj["picnum"]     = data.picnum
+            obj["overpicnum"] = data.overpicnum
+            obj["shade"]      = data.shade
+            obj["pal"]        = data.pal
+            obj["xrepeat"]    = data.xrepeat
+            obj["yrepeat"]    = data.yrepeat
+            obj["xpanning"]   = data.xpanning
+            obj["ypanning"]   = data.ypanning
+            obj["lotag"]      = data.lotag
+            obj["hitag"]      = data.hitag
+            obj["extra"]      = data.extra
     
     def saveSpriteCustomProps(self, sprite, obj):
         if (sprite is not None) and (obj is not None):
-            obj["x"] = sprite.data.x
-            obj["y"] = sprite.data.y
-            obj["z"] = sprite.data.z
-            obj["cstat bit00 blocking1"]          = (sprite.data.cstat>>0)&1
-            obj["cstat bit01 transluscence"]      = (sprite.data.cstat>>1)&1
-            obj["cstat bit02 flip x"]             = (sprite.data.cstat>>2)&1
-            obj["cstat bit03 flip y"]             = (sprite.data.cstat>>3)&1
-            obj["cstat bit05-04 face-wall-floor"] = "0b%s" % format(((sprite.data.cstat>>4)&3),'b').zfill(2)
-            obj["cstat bit06 1-sided"]            = (sprite.data.cstat>>6)&1
-            obj["cstat bit07 real center"]        = (sprite.data.cstat>>7)&1
-            obj["cstat bit08 blocking2"]          = (sprite.data.cstat>>8)&1
-            obj["cstat bit09 transl. rev."]       = (sprite.data.cstat>>9)&1
-            obj["cstat bit10-14 reserved"]        = "0b%s" % format(((sprite.data.cstat>>10)&31),'b').zfill(5)
-            obj["cstat bit15 invisible"]          = (sprite.data.cstat>>15)&1
-            obj["picnum"] = sprite.data.picnum
-            obj["shade"] = sprite.data.shade
-            obj["pal"] = sprite.data.pal
-            obj["clipdist"] = sprite.data.clipdist
-            obj["filler"] = sprite.data.filler
-            obj["xrepeat"] = sprite.data.xrepeat
-            obj["yrepeat"] = sprite.data.yrepeat
-            obj["xoffset"] = sprite.data.xoffset
-            obj["yoffset"] = sprite.data.yoffset
-            obj["sectnum"] = sprite.data.sectnum
-            obj["statnum"] = sprite.data.statnum
-            obj["ang"] = sprite.data.ang
-            obj["owner"] = sprite.data.owner
-            obj["xvel"] = sprite.data.xvel
-            obj["yvel"] = sprite.data.yvel
-            obj["zvel"] = sprite.data.zvel
-            obj["lotag"] = sprite.data.lotag
-            obj["hitag"] = sprite.data.hitag
-            obj["extra"] = sprite.data.extra
+            data  = sprite.data
+            cstat = data.cstat
+            obj["x"] = data.x
+            obj["y"] = data.y
+            obj["z"] = data.z
+            obj["cstat bit00 blocking1"]          = (cstat>>0)&1
+            obj["cstat bit01 transluscence"]      = (cstat>>1)&1
+            obj["cstat bit02 flip x"]             = (cstat>>2)&1
+            obj["cstat bit03 flip y"]             = (cstat>>3)&1
+            obj["cstat bit05-04 face-wall-floor"] = self.bitStrings2[(cstat>>4)&3]
+            obj["cstat bit06 1-sided"]            = (cstat>>6)&1
+            obj["cstat bit07 real center"]        = (cstat>>7)&1
+            obj["cstat bit08 blocking2"]          = (cstat>>8)&1
+            obj["cstat bit09 transl. rev."]       = (cstat>>9)&1
+            obj["cstat bit10-14 reserved"]        = self.bitStrings5[(cstat>>10)&31]
+            obj["cstat bit15 invisible"]          = (cstat>>15)&1
+            obj["picnum"] = data.picnum
+            obj["shade"] = data.shade
+            obj["pal"] = data.pal
+            obj["clipdist"] = data.clipdist
+            obj["filler"] = data.filler
+            obj["xrepeat"] = data.xrepeat
+            obj["yrepeat"] = data.yrepeat
+            obj["xoffset"] = data.xoffset
+            obj["yoffset"] = data.yoffset
+            obj["sectnum"] = data.sectnum
+            obj["statnum"] = data.statnum
+            obj["ang"] = data.ang
+            obj["owner"] = data.owner
+            obj["xvel"] = data.xvel
+            obj["yvel"] = data.yvel
+            obj["zvel"] = data.zvel
+            obj["lotag"] = data.lotag
+            obj["hitag"] = data.hitag
+            obj["extra"] = data.extra
 
     def getEdgesFromPolylines(self, polylines):
-        edges = list()
+        ## Yields the edges, the only caller consumes them once
         for polyline in polylines:
             for i in range(len(polyline)):
-                edges.append((polyline[i], polyline[(i + 1) % len(polyline)]))
-        return edges
+                yield (polyline[i], polyline[(i + 1) % len(polyline)])
     
     def cutPolygonIntoTrapezoids(self, polylines):
-        yCoords = sorted(set(vector.y for polyline in polylines for vector in polyline))
+        yCoords = sorted(set(point[1] for polyline in polylines for point in polyline))
         trapezoids = list()
-    
+
+        toFloat32 = self.float32x4Struct
+        
+        ## Build the edges once with the lower point first and their deltas, they are the same for every scanline band
+        edges = list()
+        for edge in self.getEdgesFromPolylines(polylines):
+            (v0x, v0y), (v1x, v1y) = edge if edge[0][1] <= edge[1][1] else (edge[1], edge[0])
+            edges.append((v0x, v0y, v1x, v1y, v1x - v0x, v1y - v0y))
+
         for yIdx in range(len(yCoords)-1):
+            yBottom = yCoords[yIdx]
+            yTop    = yCoords[yIdx+1]
             xCoords = list()
-            for edge in self.getEdgesFromPolylines(polylines):
-                v0, v1 = edge if edge[0].y <= edge[1].y else (edge[1], edge[0])
-                if not (v0.y >= yCoords[yIdx + 1] or v1.y <= yCoords[yIdx]):
-                    x0 = v0.x if v0.y >= yCoords[yIdx]   else (yCoords[yIdx]   - v0.y) * (v1.x - v0.x) / (v1.y - v0.y) + v0.x
-                    x1 = v1.x if v1.y <= yCoords[yIdx+1] else (yCoords[yIdx+1] - v0.y) * (v1.x - v0.x) / (v1.y - v0.y) + v0.x
+            for v0x, v0y, v1x, v1y, deltaX, deltaY in edges:
+                if not (v0y >= yTop or v1y <= yBottom):
+                    x0 = v0x if v0y >= yBottom else (yBottom - v0y) * deltaX / deltaY + v0x
+                    x1 = v1x if v1y <= yTop    else (yTop    - v0y) * deltaX / deltaY + v0x
                     xCoords.append((x0, x1))
             
             xCoords.sort(key=lambda x: x[0] + x[1])
 
+            x0s = [x[0] for x in xCoords]
+            x1s = [x[1] for x in xCoords]
+            numXCoords = len(xCoords)
             xIdx = 0
-            while xIdx < len(xCoords):
+            while xIdx < numXCoords:
                 xEndIdx = xIdx + 1
-                while (xEndIdx+2 < len(xCoords)) \
-                        and (xCoords[xEndIdx+1][0] <= xCoords[xEndIdx][0]) \
-                        and (xCoords[xEndIdx+1][1] <= xCoords[xEndIdx][1]):
+                while (xEndIdx+2 < numXCoords) \
+                        and (x0s[xEndIdx+1] <= x0s[xEndIdx]) \
+                        and (x1s[xEndIdx+1] <= x1s[xEndIdx]):
                     xEndIdx += 2
-                trapezoids.append([ Vector(( xCoords[xIdx][0],    yCoords[yIdx]   )),
-                                    Vector(( xCoords[xEndIdx][0], yCoords[yIdx]   )),
-                                    Vector(( xCoords[xEndIdx][1], yCoords[yIdx+1] )),
-                                    Vector(( xCoords[xIdx][1],    yCoords[yIdx+1] )) ])
+                ## Corner x coordinates are rounded to float32 like the Vectors the corners used to be
+                x0Start, x0End, x1End, x1Start = toFloat32.unpack(toFloat32.pack(x0s[xIdx], x0s[xEndIdx], x1s[xEndIdx], x1s[xIdx]))
+                trapezoids.append([ ( x0Start, yBottom ),
+                                    ( x0End,   yBottom ),
+                                    ( x1End,   yTop    ),
+                                    ( x1Start, yTop    ) ])
                 xIdx = xEndIdx + 1
         
         return trapezoids
@@ -221,53 +261,50 @@ class BuildMapImporter:
         spriteCollection.children.link(colFloorSprites)
         spriteCollection.children.link(colEffectSprites)
         spriteCache = dict()
+        wallSpriteOffsets = dict()
+        kindCollections = (colEffectSprites, colFaceSprites, colWallSprites, colFloorSprites, spriteCollection)  ## Indexed by sprite.getKind()
         
+        updateProgress = self.updateProgress
+        numSprites = self.bmap.data.numsprites
         for sprite in self.bmap.sprites:
-            self.wm.progress_update(sprite.spriteIndex / self.bmap.data.numsprites)
+            updateProgress(sprite.spriteIndex / numSprites)
             
-            if sprite.isEffectSprite():
-                collection = colEffectSprites
-            elif sprite.isFaceSprite():
-                collection = colFaceSprites
-            elif sprite.isWallSprite():
-                collection = colWallSprites
-            elif sprite.isFloorSprite():
-                collection = colFloorSprites
-            else:
-                collection = spriteCollection
+            collection = kindCollections[sprite.getKind()]
             
-            spriteWithEqualData = spriteCache.get(sprite.getDataKey(), None)
-            if spriteWithEqualData is None:
-                objCrtr = self.meshObjectCreator(self.matManager, name=sprite.getName(prefix=self.objectPrefix), shadeToVertexColors=shadeToVertexColors)
+            ## spriteCache memoizes the created data per data key for this import only,
+            ## a module level cache would keep references to Blender data that can be deleted or undone.
+            dataKey = sprite.getDataKey()
+            spriteName = sprite.getName(prefix=self.objectPrefix)
+            cachedMesh = spriteCache.get(dataKey, None)
+            if cachedMesh is None:
+                objCrtr = self.meshObjectCreator(self.matManager, name=spriteName, shadeToVertexColors=shadeToVertexColors)
                 dims = self.matManager.getDimensions(sprite.data.picnum)
                 scale_x = dims[0] / 64
                 scale_y = dims[1] / 64
                 
                 if sprite.isFloorSprite():
-                    objCrtr.verts = [Vector((-1 * scale_y, -1 * scale_x, 0)),
-                                     Vector(( 1 * scale_y, -1 * scale_x, 0)),
-                                     Vector(( 1 * scale_y,  1 * scale_x, 0)),
-                                     Vector((-1 * scale_y,  1 * scale_x, 0))]
+                    objCrtr.verts = [(-1 * scale_y, -1 * scale_x, 0),
+                                     ( 1 * scale_y, -1 * scale_x, 0),
+                                     ( 1 * scale_y,  1 * scale_x, 0),
+                                     (-1 * scale_y,  1 * scale_x, 0)]
                 elif sprite.isRealCentered():
-                    objCrtr.verts = [Vector((0,  1 * scale_x, -1 * scale_y)),
-                                     Vector((0,  1 * scale_x,  1 * scale_y)),
-                                     Vector((0, -1 * scale_x,  1 * scale_y)),
-                                     Vector((0, -1 * scale_x, -1 * scale_y))]
+                    objCrtr.verts = [(0,  1 * scale_x, -1 * scale_y),
+                                     (0,  1 * scale_x,  1 * scale_y),
+                                     (0, -1 * scale_x,  1 * scale_y),
+                                     (0, -1 * scale_x, -1 * scale_y)]
                 else:
-                    objCrtr.verts = [Vector((0,  1 * scale_x, 0 * scale_y)),
-                                     Vector((0,  1 * scale_x, 2 * scale_y)),
-                                     Vector((0, -1 * scale_x, 2 * scale_y)),
-                                     Vector((0, -1 * scale_x, 0 * scale_y))]
+                    objCrtr.verts = [(0,  1 * scale_x, 0 * scale_y),
+                                     (0,  1 * scale_x, 2 * scale_y),
+                                     (0, -1 * scale_x, 2 * scale_y),
+                                     (0, -1 * scale_x, 0 * scale_y)]
                 
                 objCrtr.addFace([0, 1, 2, 3], sprite.data.picnum, sprite.getShadeColor())
-                flipX = int(sprite.isFlippedX())
-                flipY = int(sprite.isFlippedY())
-                objCrtr.vertUVs = [(1-flipX, flipY), (1-flipX, 1-flipY), (flipX, 1-flipY), (flipX, flipY)]
+                objCrtr.vertUVs = list(self.spriteQuadUVs[(int(sprite.isFlippedX()), int(sprite.isFlippedY()))])
                 newObj = objCrtr.create(collection)
-                spriteCache[sprite.getDataKey()] = newObj
+                spriteCache[dataKey] = newObj.data  ## The mesh carries the materials and UVs, objects only add the transform
             else:
                 ## Create a new Object linked to existing data
-                newObj = bpy.data.objects.new(sprite.getName(prefix=self.objectPrefix), spriteWithEqualData.data)
+                newObj = bpy.data.objects.new(spriteName, cachedMesh)
                 collection.objects.link(newObj)
             
             newObj.scale = sprite.getScale(scaleSpritesLikeInGame)
@@ -278,8 +315,11 @@ class BuildMapImporter:
             
             if sprite.isWallSprite():
                 ## In case of Wall Sprites, give them a customisable offset to the wall to avoid z-fighting
-                xoffset = wallSpriteOffset * math.cos(sprite.angle)
-                yoffset = wallSpriteOffset * math.sin(sprite.angle)
+                ## Wall sprites mostly share a few angles, so the offsets are cached per BUILD angle
+                offsets = wallSpriteOffsets.get(sprite.data.ang)
+                if offsets is None:
+                    offsets = wallSpriteOffsets[sprite.data.ang] = (wallSpriteOffset * math.cos(sprite.angle), wallSpriteOffset * math.sin(sprite.angle))
+                xoffset, yoffset = offsets
                 newObj.location.x += xoffset
                 newObj.location.y += yoffset
             
@@ -287,100 +327,95 @@ class BuildMapImporter:
     
     
     
-    def calculateSectorUVCoords(self, level, xCoord, yCoord):
+    def getSectorUVContext(self, level):
+        ## Everything calculateSectorUVCoords needs that does not depend on the vertex, computed once per level
         picDimX,picDimY = self.matManager.getDimensions(level.getPicNum())
         panX,panY       = level.getTexPanning()
         expFactor       = level.getTexExpansion()
-        uvXFactor       = float(32)/picDimX * expFactor
-        uvYFactor       = float(32)/picDimY * expFactor
-        flipXFactor     = level.getTexFlipXFactor()
-        flipYFactor     = level.getTexFlipYFactor()
-        
+        uvXFactor       = float(32)/picDimX * expFactor * level.getTexFlipXFactor()  ## flip factors are +-1, so folding them in is exact
+        uvYFactor       = float(32)/picDimY * expFactor * level.getTexFlipYFactor()
+        alignment       = None
         if level.isTexAlignToFirstWall():
+            ## Origin and rotation (cos, sin) of the first walls coordinate system
+            firstWall = level.sector.walls[0]
+            alignment = (firstWall.xScal, firstWall.yScalFlipped, math.cos(firstWall.angle), math.sin(firstWall.angle))
+        return (uvXFactor, uvYFactor, panX, panY, level.getTexSwapXY(), alignment)
+    
+    def calculateSectorUVCoords(self, level, uvContext, xCoord, yCoord):
+        uvXFactor, uvYFactor, panX, panY, swapXY, alignment = uvContext
+        
+        if alignment is not None:
             ## convert xCoord and yCoord to a coordinate system centered on and aligned with the first sector wall
-            vertexVectorAligned = Vector((xCoord, yCoord*-1)) - level.sector.walls[0].startVect
-            vertexVectorAligned.rotate(mathutils.Matrix.Rotation(level.sector.walls[0].angle, 2))
+            originX, originY, cosAngle, sinAngle = alignment
+            deltaX = xCoord - originX
+            deltaY = yCoord*-1 - originY
+            alignedX = cosAngle*deltaX - sinAngle*deltaY
+            alignedY = sinAngle*deltaX + cosAngle*deltaY
             
             ## Correct Y Dimension for Alligned Case
             zDiff = level.zScal*-1 - level.getHeightAtPos(xCoord, yCoord)*-1
-            vertexVectorAligned_y = float(math.sqrt(zDiff * zDiff + vertexVectorAligned.y * vertexVectorAligned.y))
-            if vertexVectorAligned.y < 0:
-                vertexVectorAligned_y *= -1  ## Restore Sign
+            alignedYCorrected = math.hypot(zDiff, alignedY)
+            if alignedY < 0:
+                alignedYCorrected *= -1  ## Restore Sign
             
-            if level.getTexSwapXY():
-                uvx = vertexVectorAligned_y*flipXFactor*uvXFactor+panX
-                uvy = vertexVectorAligned.x*flipYFactor*uvYFactor+panY
+            if swapXY:
+                uvx = alignedYCorrected*uvXFactor+panX
+                uvy = alignedX*uvYFactor+panY
             else:
-                uvx = vertexVectorAligned.x*flipXFactor*uvXFactor+panX
-                uvy = vertexVectorAligned_y*flipYFactor*uvYFactor+panY
+                uvx = alignedX*uvXFactor+panX
+                uvy = alignedYCorrected*uvYFactor+panY
         else:
-            if level.getTexSwapXY():
-                uvx = yCoord*flipXFactor*uvXFactor+panX
-                uvy = xCoord*flipYFactor*uvYFactor+panY
+            if swapXY:
+                uvx = yCoord*uvXFactor+panX
+                uvy = xCoord*uvYFactor+panY
             else:
-                uvx = xCoord*flipXFactor*uvXFactor+panX
-                uvy = yCoord*flipYFactor*uvYFactor+panY
+                uvx = xCoord*uvXFactor+panX
+                uvy = yCoord*uvYFactor+panY
         return (uvx,uvy)
     
     
-    def calculateWallUVCoord(self, inputCoord, alignTexZ, flipFactor, repeat, panning, picDim, panDivisor, panSign, pixFactor, flipPlus, flipAtStart):
-        outputUV = inputCoord - alignTexZ     ## Align to alignTexZPx (Both must already be relative to the Bottom of the wall)
-        
-        if flipAtStart and flipFactor < 0:
-            outputUV *= flipFactor
-            outputUV += flipPlus              ## + one wall width to make it appear as the wall mirrored on itself instead mirrored on the origin
-        
-        outputUV *= repeat * 8 * pixFactor    ## repeat * 8 tells how many pixels the whole width of the wall covers. After this line outputUV means: "Pixels covered by wallWidth"
-        outputUV /= float(picDim)             ## convert pixel coordinates into image coordinates from here on
-        outputUV += (float(panning) / float(panDivisor)) * panSign
-        
-        if not flipAtStart and flipFactor < 0:
-            outputUV *= flipFactor
-            outputUV += flipPlus              ## + one wall width to make it appear as the wall mirrored on itself instead mirrored on the origin
-        
-        return outputUV
-    
-    
-    def calculateWallUVCoords(self, wPart, vertex):
+    def getWallUVContext(self, wPart):
+        ## Everything calculateWallUVCoords needs that does not depend on the vertex, computed once per wall part
         wall                       = wPart.wall
-        alignTexZ                  = wPart.alignTexZ*-1
+        wallData                   = wall.data
         picDimX,picDimY            = self.matManager.getDimensions(wPart.getPicNum())
-        vertexDistFromWallStart    = (Vector((vertex.x, vertex.y*-1)) - wall.startVect).length
-        zCoordRelativeToZBottom    = ((vertex.z*-1) - wPart.zBottom*-1)
-        alignTexZRelativeToZBottom = (alignTexZ - wPart.zBottom*-1)
+        zBottom                    = wPart.zBottom*-1
+        alignTexZRelativeToZBottom = (wPart.alignTexZ*-1 - zBottom)
         
         ## X panning increases when the texture is moved left (uv coordinate moved right) and is realative to the texture width (not a fixed value like Y Panning)
-        inputXCoord = 0.0 if wall.length == 0 else (vertexDistFromWallStart / wall.length)
-        uvx = self.calculateWallUVCoord( inputCoord  = inputXCoord,
-                                         alignTexZ   = 0,
-                                         flipFactor  = wall.getTexFlipXFactor(),
-                                         repeat      = wall.data.xrepeat,
-                                         panning     = wall.data.xpanning,
-                                         picDim      = picDimX,
-                                         panDivisor  = picDimX,
-                                         panSign     = 1,
-                                         pixFactor   = 1,
-                                         flipPlus    = 1,
-                                         flipAtStart = True )
+        ## xrepeat * 8 tells how many pixels the whole width of the wall covers
+        xContext = (wall.getTexFlipXFactor() < 0, wallData.xrepeat * 8, picDimX, float(wallData.xpanning) / picDimX)
         
         ## 1pud = 1024z = 4px = 0.125m
         ## default wall height = 16pud = 16384z = 64px = 2m
         ## the default wall height of 8192*2 z units is supposed to fit 64 pixels of a non stretched texture
         ## (wall.yrepeat * 8) this is how many pixels a wall of the default height of (8192*2) really covers! (not 64 anymore) (a wall of different height covers different amout of pixels)
         ## ypanning=256 means moving the texture up (vertex down) one size of the whole image how it appears stretched (moving much more if stretched wide)
-        uvy = self.calculateWallUVCoord( inputCoord  = zCoordRelativeToZBottom,
-                                         alignTexZ   = alignTexZRelativeToZBottom,
-                                         flipFactor  = wall.getTexFlipYFactor(),
-                                         repeat      = wall.data.yrepeat,
-                                         panning     = wall.data.ypanning,
-                                         picDim      = picDimY,
-                                         panDivisor  = 256,
-                                         panSign     = -1,
-                                         pixFactor   = 0.5,
-                                         flipPlus    = 0,
-                                         flipAtStart = False )
+        yContext = (wall.getTexFlipYFactor() < 0, wallData.yrepeat * 8 * 0.5, picDimY, float(wallData.ypanning) / 256)
+        
+        return (wall.xScal, wall.yScalFlipped, wall.length, zBottom, alignTexZRelativeToZBottom, xContext, yContext, wall.getTexRotate())
+    
+    def calculateWallUVCoords(self, uvContext, vertex):
+        startX, startY, wallLength, zBottom, alignTexZRelativeToZBottom, xContext, yContext, texRotate = uvContext
+        flipX, xPixels, picDimX, xPanning = xContext
+        flipY, yPixels, picDimY, yPanning = yContext
+        vertX, vertY, vertZ = vertex
+        
+        uvx = 0.0 if wallLength == 0 else (self.float32Struct.unpack(self.float32Struct.pack(math.hypot(vertX - startX, vertY*-1 - startY)))[0] / wallLength)
+        if flipX:
+            uvx = 1 - uvx  ## mirror on the wall itself (flip and add one wall width) instead of on the origin
+        uvx *= xPixels
+        uvx /= picDimX     ## convert pixel coordinates into image coordinates from here on
+        uvx += xPanning
+        
+        uvy = ((vertZ*-1) - zBottom) - alignTexZRelativeToZBottom  ## Align to alignTexZ (Both are relative to the Bottom of the wall)
+        uvy *= yPixels
+        uvy /= picDimY
+        uvy -= yPanning
+        if flipY:
+            uvy *= -1      ## flipped after panning, unlike x
         
-        if wall.getTexRotate():  ## TODO This does not correctly rotate the textures but better that nothing. The correct way to do it is currently unknown.
+        if texRotate:  ## TODO This does not correctly rotate the textures but better that nothing. The correct way to do it is currently unknown.
             return (uvy,uvx)
         
         return (uvx,uvy)
@@ -400,8 +435,10 @@ class BuildMapImporter:
         objCrtrMap = self.meshObjectCreator(self.matManager, name="%sMapGeometry"%self.objectPrefix, shadeToVertexColors=shadeToVertexColors)
         objCrtrSky = self.meshObjectCreator(self.matManager, name="%sMapGeometry_Sky"%self.objectPrefix, shadeToVertexColors=shadeToVertexColors)
         
+        updateProgress = self.updateProgress
+        numSectors = self.bmap.data.numsectors
         for sector in self.bmap.getSectors():
-            self.wm.progress_update(sector.sectorIndex / self.bmap.data.numsectors)
+            updateProgress(sector.sectorIndex / numSectors)
             
             ## Try to get polygon partitions from blenders tessellate_polygon method
             ## This can fail on degenerate geometry
@@ -409,8 +446,8 @@ class BuildMapImporter:
             faceIndicesCovered = set([idx  for face in faceIndices  for idx in face])
             tessellationValid = len(faceIndicesCovered) == sector.data.wallnum
             if not tessellationValid:
-                log.warning("tessellate_polygon result invalid for sector %s likely because of degenerate geometry! Using Fallback." % sector.sectorIndex)
-                log.debug("tessellate_polygon result invalid for sector %s: sector.data.wallnum %s  !=  len(faceIndicesCovered) %s  faceIndicesCovered: %s" % (sector.sectorIndex, sector.data.wallnum, len(faceIndicesCovered), faceIndicesCovered))
+                log.warning("tessellate_polygon result invalid for sector %s likely because of degenerate geometry! Using Fallback.", sector.sectorIndex)
+                log.debug("tessellate_polygon result invalid for sector %s: sector.data.wallnum %s  !=  len(faceIndicesCovered) %s  faceIndicesCovered: %s", sector.sectorIndex, sector.data.wallnum, len(faceIndicesCovered), faceIndicesCovered)
 
             for level in sector.getLevel():
                 levelSplitSky = splitSky and level.isParallaxing()
@@ -419,22 +456,27 @@ class BuildMapImporter:
                 else:
                     objCrtrLvl = objCrtrSky if levelSplitSky else objCrtrMap
                 
+                uvContext = self.getSectorUVContext(level)
                 if tessellationValid:
+                    ## Each wall corner is shared by several triangles, so calculate its UV only once
+                    wallUVs = [self.calculateSectorUVCoords(level, uvContext, wall.xScal, wall.yScal) for wall in sector.walls]
+                    picnum, shadeColor, isCeiling = level.getPicNum(), level.getShadeColor(), level.isCeiling()
+                    vertIdx = objCrtrLvl.vertIdx
                     for faceIdxTriple in faceIndices:
-                        objCrtrLvl.addFace([objCrtrLvl.vertIdx+faceIdxTriple[0], objCrtrLvl.vertIdx+faceIdxTriple[1], objCrtrLvl.vertIdx+faceIdxTriple[2]], level.getPicNum(), level.getShadeColor(), flipped=level.isCeiling())
-                        for faceIdx in faceIdxTriple:
-                            objCrtrLvl.vertUVs.append(self.calculateSectorUVCoords(level, sector.walls[faceIdx].xScal, sector.walls[faceIdx].yScal))
-                    for wall in sector.walls:
-                        objCrtrLvl.verts.append(Vector((wall.xScal, wall.yScal*-1, level.getHeightAtPos(wall.xScal, wall.yScal)*-1)))
-                        objCrtrLvl.vertIdx += 1
+                        objCrtrLvl.addFace([vertIdx+faceIdxTriple[0], vertIdx+faceIdxTriple[1], vertIdx+faceIdxTriple[2]], picnum, shadeColor, flipped=isCeiling)
+                        objCrtrLvl.vertUVs.extend([wallUVs[faceIdx] for faceIdx in faceIdxTriple])
+                    wallHeights = level.getHeightsAtPositions([(wall.xScal, wall.yScal) for wall in sector.walls])
+                    for wall, z in zip(sector.walls, wallHeights):
+                        objCrtrLvl.verts.append((wall.xScal, wall.yScalFlipped, z*-1))
+                    objCrtrLvl.vertIdx += len(sector.walls)
                 else:
                     ## Fallback in case tessellate_polygon did not succeed - likely because of degenerate geometry
                     for trapezoid in self.cutPolygonIntoTrapezoids(sector.getPolyLines()):
                         face = list()
-                        for vert in trapezoid:
-                            z = level.getHeightAtPos(vert.x, vert.y)
-                            objCrtrLvl.verts.append(Vector((vert.x, vert.y*-1, z*-1)))
-                            objCrtrLvl.vertUVs.append(self.calculateSectorUVCoords(level, vert.x, vert.y))
+                        for vertX, vertY in trapezoid:
+                            z = level.getHeightAtPos(vertX, vertY)
+                            objCrtrLvl.verts.append((vertX, vertY*-1, z*-1))
+                            objCrtrLvl.vertUVs.append(self.calculateSectorUVCoords(level, uvContext, vertX, vertY))
                             face.append(objCrtrLvl.vertIdx)
                             objCrtrLvl.vertIdx += 1
                         objCrtrLvl.addFace(face, level.getPicNum(), level.getShadeColor(), flipped=level.isFloor())
@@ -451,9 +493,10 @@ class BuildMapImporter:
                     if splitThisWall:
                         objCrtrWall = self.meshObjectCreator(self.matManager, name=wPart.getName(prefix=self.objectPrefix), shadeToVertexColors=shadeToVertexColors)
                     face = list()
+                    uvContext = self.getWallUVContext(wPart)
                     for vert in wPart.getClippedVertices():
-                        objCrtrWall.verts.append(Vector((vert.x, vert.y*-1, vert.z*-1)))
-                        objCrtrWall.vertUVs.append(self.calculateWallUVCoords(wPart, vert))
+                        objCrtrWall.verts.append((vert[0], vert[1]*-1, vert[2]*-1))
+                        objCrtrWall.vertUVs.append(self.calculateWallUVCoords(uvContext, vert))
                         face.append(objCrtrWall.vertIdx)
                         objCrtrWall.vertIdx += 1
                     if len(face) > 0:
@@ -470,11 +513,10 @@ class BuildMapImporter:
         def __init__(self, matManager, name="NewObject", shadeToVertexColors=True):
             self.matManager = matManager
             self.name = name
-            self.verts = list()
+            self.verts = list()  ## Plain (x, y, z) tuples, from_pydata does not need Vector objects
             self.vertUVs = list()
-            self.edges = list()
             self.faces = list()
-            self.facePicnums = list()
+            self.faceMatIndices = list()
             self.faceShadeColors = list()
             self.faceIsFlipped = list()
             self.picnumMatIdxDict = dict()
@@ -485,43 +527,55 @@ class BuildMapImporter:
         
         def addFace(self, face, picnum=0, vertShadeColor=(1.0, 1.0, 1.0, 1.0), flipped=False):
             self.faces.append(face)
-            self.facePicnums.append(picnum)
             self.faceShadeColors.append(vertShadeColor)
             self.faceIsFlipped.append(flipped)
+            self.faceMatIndices.append(self.picnumMatIdxDict.setdefault(picnum, len(self.picnumMatIdxDict)))  ## Material slots in order of first use
         
         def create(self, collection=None):
             if len(self.verts) <= 0:
                 return self.obj
 
+            ## Reverse the loops of flipped faces together with their UVs up front instead of calling face.flip() afterwards
+            faces = list()
+            vertUVs = list()
+            loopStart = 0
+            for face, flipped in zip(self.faces, self.faceIsFlipped):
+                loopEnd = loopStart + len(face)
+                if flipped:
+                    faces.append(face[::-1])
+                    vertUVs.extend(reversed(self.vertUVs[loopStart:loopEnd]))
+                else:
+                    faces.append(face)
+                    vertUVs.extend(self.vertUVs[loopStart:loopEnd])
+                loopStart = loopEnd
+
             mesh = bpy.data.meshes.new(self.name)
-            mesh.from_pydata(self.verts, self.edges, self.faces)
+            mesh.from_pydata(self.verts, [], faces)
             # mesh.validate(verbose=True)  # useful for development when the mesh may be invalid.
             self.obj = bpy.data.objects.new(self.name, mesh)
 
             if collection is not None:
                 collection.objects.link(self.obj)
 
-            ## Create the materials and append them to the new object
-            for matIdx, picnum in enumerate(set(self.facePicnums)):
+            ## Create the materials and append them to the new object, picnumMatIdxDict is filled by addFace in slot order
+            for picnum in self.picnumMatIdxDict:
                 mat = self.matManager.getMaterial(picnum)
                 self.obj.data.materials.append(mat)
-                self.picnumMatIdxDict[picnum] = matIdx
 
-            ## Create UV Map
+            ## Create UV Map, foreach_set takes the flattened coordinates of all loops in one call
             newUVMap = self.obj.data.uv_layers.new(name="UVMap", do_init=False)
-            for idx, loop in enumerate(self.obj.data.loops):
-                newUVMap.data[idx].uv = self.vertUVs[idx]
+            newUVMap.data.foreach_set("uv", [coord for uv in vertUVs for coord in uv])
+
+            ## Assign the materials
+            mesh.polygons.foreach_set("material_index", self.faceMatIndices)
 
-            ## Loop over the faces again to assign the materials, vertex colors and flip normals for correct face orientation
+            ## Assign the vertex colors, every loop of a face gets the faces shade color
             if self.shadeToVertexColors:
                 self.vertColorLayer = self.obj.data.vertex_colors.new(name="Shade", do_init=False)
                 #self.vertColorLayer = self.obj.data.color_attributes.new(name="Shade", domain='CORNER', type='BYTE_COLOR')  ## This method results in lighter colors (gamma correction?)! e.g.: 0xd6d0d2 instead of 0xaba1a5
-            for face in self.obj.data.polygons:
-                face.material_index = self.picnumMatIdxDict[self.facePicnums[face.index]]
-                if self.faceIsFlipped[face.index]:
-                    face.flip()
-                if self.vertColorLayer is not None:
-                    for loop_idx in face.loop_indices:
-                        self.vertColorLayer.data[loop_idx].color = self.faceShadeColors[face.index]
+                loopColors = list()
+                for face, shadeColor in zip(self.faces, self.faceShadeColors):
+                    loopColors.extend(shadeColor * len(face))
+                self.vertColorLayer.data.foreach_set("color", loopColors)
 
             return self.obj
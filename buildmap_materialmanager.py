@@ -32,7 +32,7 @@ log = logging.getLogger(__name__)
 
 class materialManager:
     def __init__(self, texFolder, userArtTexFolder, reuseExistingMaterials=True, sampleClosestTexel=True, shadeToVertexColors=True, proceduralMaterialEffects=False, useBackfaceCulling=False):
-        log.debug("materialManager init with texFolder: %s  userArtTexFolder: %s  sampleClosestTexel: %s  shadeToVertexColors: %s" % (texFolder, userArtTexFolder, sampleClosestTexel, shadeToVertexColors))
+        log.debug("materialManager init with texFolder: %s  userArtTexFolder: %s  sampleClosestTexel: %s  shadeToVertexColors: %s", texFolder, userArtTexFolder, sampleClosestTexel, shadeToVertexColors)
         self.blversion = bpy.app.version
         self.textureFolder = None
         self.userArtTextureFolder = None
@@ -100,7 +100,7 @@ class materialManager:
                 ## A filename matching this regex does not specify the whole picnum and is only acceptable as fallback for User Art:
                 regexUserArtFallback = re.compile(r"^0{0,2}%d-.{3}\.(jpg|png)$" % self.getArtFileIndex(picnum), re.IGNORECASE)
                 imgFilePath = self.getDictValueByKeyRegex(userArtTexFileMap, regexUserArtFallback)
-                log.debug("Tried to find User Art for picnum %d using fallback RegEx, resulting in: %s" % (picnum, imgFilePath))
+                log.debug("Tried to find User Art for picnum %d using fallback RegEx, resulting in: %s", picnum, imgFilePath)
         
         ## If we could not get any User Art file, search the normal file map
         if (imgFilePath is None) and isinstance(texFileMap, dict) and (len(texFileMap) > 0):
@@ -112,7 +112,7 @@ class materialManager:
         if (imgFilePath is None) and isinstance(userArtTexFileMap, dict) and (len(userArtTexFileMap) > 0):
             imgFilePath = self.getDictValueByKeyRegex(userArtTexFileMap, regexDefault)
             if imgFilePath is not None:
-                log.debug("Non User Art texture found in User Art folder: %s" % imgFilePath)
+                log.debug("Non User Art texture found in User Art folder: %s", imgFilePath)
         
         return imgFilePath
     
@@ -132,10 +132,10 @@ class materialManager:
                         break
                     if regexDefault.match(node.image.name):
                         self.dimensionsDict[picnum] = node.image.size
-                        log.debug("Image Node in existing material %s found using regex." % matName)
+                        log.debug("Image Node in existing material %s found using regex.", matName)
                         break
             else:
-                log.debug("Found existing material %s but no image node! Known imgFilePath: %s" % (matName, imgFilePath))
+                log.debug("Found existing material %s but no image node! Known imgFilePath: %s", matName, imgFilePath)
                 if imgFilePath is not None:
                     ## In case no image node is found but we know the path of the texture,
                     ## just generate one to get the size from it. It can be deleted again afterwards.